@@ -4,12 +4,24 @@ Modern dark-mode dashboard for support team analytics
 """
 
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+import numpy as np
 import pandas as pd
 from google.cloud import bigquery
-from datetime import datetime, timedelta
+from google.cloud import bigquery_storage
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+import hashlib
 import os
+import threading
+import time
 
 # Page config - MUST be first Streamlit command
 st.set_page_config(
@@ -22,173 +34,6 @@ st.set_page_config(
 # Streamlit Community Cloud handles authentication via settings
 # No custom OAuth needed - just configure in Streamlit Cloud dashboard
 
-# Dark mode custom CSS
-st.markdown("""
-<style>
-    /* Main background */
-    .stApp {
-        background: linear-gradient(135deg, #0f0f1a 0%, #1a1a2e 50%, #16213e 100%);
-    }
-
-    /* Hide Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-
-    /* Custom metric cards */
-    .metric-card {
-        background: linear-gradient(145deg, #1e1e2f 0%, #2a2a4a 100%);
-        border-radius: 16px;
-        padding: 24px;
-        border: 1px solid rgba(255,255,255,0.1);
-        box-shadow: 0 8px 32px rgba(0,0,0,0.3);
-        transition: transform 0.3s ease, box-shadow 0.3s ease;
-    }
-
-    .metric-card:hover {
-        transform: translateY(-4px);
-        box-shadow: 0 12px 40px rgba(0,0,0,0.4);
-    }
-
-    .metric-value {
-        font-size: 42px;
-        font-weight: 700;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        margin: 0;
-    }
-
-    .metric-label {
-        font-size: 14px;
-        color: #8892b0;
-        text-transform: uppercase;
-        letter-spacing: 1.5px;
-        margin-top: 8px;
-    }
-
-    .metric-delta-positive {
-        color: #64ffda;
-        font-size: 14px;
-    }
-
-    .metric-delta-negative {
-        color: #ff6b6b;
-        font-size: 14px;
-    }
-
-    /* Header styling */
-    .dashboard-header {
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        font-size: 48px;
-        font-weight: 800;
-        margin-bottom: 8px;
-    }
-
-    .dashboard-subtitle {
-        color: #8892b0;
-        font-size: 16px;
-        margin-bottom: 32px;
-    }
-
-    /* Section headers */
-    .section-header {
-        color: #ccd6f6;
-        font-size: 24px;
-        font-weight: 600;
-        margin: 32px 0 16px 0;
-        padding-bottom: 8px;
-        border-bottom: 2px solid rgba(102, 126, 234, 0.3);
-    }
-
-    /* Status badges */
-    .status-badge {
-        display: inline-block;
-        padding: 4px 12px;
-        border-radius: 20px;
-        font-size: 12px;
-        font-weight: 600;
-        text-transform: uppercase;
-    }
-
-    .status-healthy {
-        background: rgba(100, 255, 218, 0.2);
-        color: #64ffda;
-    }
-
-    .status-warning {
-        background: rgba(255, 214, 102, 0.2);
-        color: #ffd666;
-    }
-
-    .status-critical {
-        background: rgba(255, 107, 107, 0.2);
-        color: #ff6b6b;
-    }
-
-    /* Table styling */
-    .dataframe {
-        background: #1e1e2f !important;
-        border-radius: 12px;
-    }
-
-    .dataframe th {
-        background: #2a2a4a !important;
-        color: #ccd6f6 !important;
-    }
-
-    .dataframe td {
-        color: #8892b0 !important;
-    }
-
-    /* Plotly chart backgrounds */
-    .js-plotly-plot .plotly .bg {
-        fill: transparent !important;
-    }
-
-    /* Live indicator */
-    .live-indicator {
-        display: inline-flex;
-        align-items: center;
-        gap: 8px;
-        color: #64ffda;
-        font-size: 12px;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-    }
-
-    .live-dot {
-        width: 8px;
-        height: 8px;
-        background: #64ffda;
-        border-radius: 50%;
-        animation: pulse 2s infinite;
-    }
-
-    @keyframes pulse {
-        0%, 100% { opacity: 1; transform: scale(1); }
-        50% { opacity: 0.5; transform: scale(1.2); }
-    }
-
-    /* Scrollbar */
-    ::-webkit-scrollbar {
-        width: 8px;
-        height: 8px;
-    }
-
-    ::-webkit-scrollbar-track {
-        background: #1a1a2e;
-    }
-
-    ::-webkit-scrollbar-thumb {
-        background: #667eea;
-        border-radius: 4px;
-    }
-</style>
-""", unsafe_allow_html=True)
-
 # Plotly dark theme
 PLOTLY_THEME = {
     'paper_bgcolor': 'rgba(0,0,0,0)',
@@ -206,6 +51,15 @@ PLOTLY_THEME = {
     }
 }
 
+# Merge the theme over the stock template once per process; app.py reruns on every
+# interaction, and a 'plotly+support_dark' default would re-merge on every figure.
+# Charts are rendered with theme=None, otherwise Streamlit's theme overwrites the template colors.
+if 'support_dark' not in pio.templates:
+    pio.templates['support_dark'] = pio.templates.merge_templates(
+        pio.templates['plotly'], go.layout.Template(layout=PLOTLY_THEME)
+    )
+pio.templates.default = 'support_dark'
+
 COLORS = {
     'primary': '#667eea',
     'secondary': '#764ba2',
@@ -216,80 +70,167 @@ COLORS = {
     'gradient': ['#667eea', '#764ba2', '#f093fb', '#f5576c']
 }
 
+# Plotly config for display-only charts: no hover, zoom or mode bar handlers
+STATIC_CHART_CONFIG = {'staticPlot': True, 'displayModeBar': False}
+
+HOURS = range(24)
+
+# Local Parquet cache for query results, shared across restarts and replicas on the same disk.
+# It lives in a private (0700) directory next to the app rather than the shared temp dir, so
+# other users can neither read the cached support data nor plant results for us to display.
+# A disk hit is then held in memory for a full CACHE_TTL_SECONDS, so files are only reused
+# while younger than DISK_CACHE_MAX_AGE_SECONDS; worst-case staleness is 7.5 minutes.
+CACHE_DIR = Path(__file__).parent / ".cache" / "queries"
+CACHE_TTL_SECONDS = 300
+DISK_CACHE_MAX_AGE_SECONDS = CACHE_TTL_SECONDS // 2
+
 
 def apply_dark_theme(fig, height=350, **kwargs):
-    """Apply dark theme to a plotly figure."""
-    layout_args = {
-        'paper_bgcolor': 'rgba(0,0,0,0)',
-        'plot_bgcolor': 'rgba(0,0,0,0)',
-        'font': {'color': '#ccd6f6', 'family': 'Inter, sans-serif'},
-        'height': height,
-        'margin': kwargs.get('margin', dict(l=0, r=0, t=20, b=0)),
-        'xaxis': {
-            'gridcolor': 'rgba(255,255,255,0.1)',
-            'linecolor': 'rgba(255,255,255,0.1)',
-            'tickfont': {'color': '#8892b0'},
-            **kwargs.get('xaxis', {})
-        },
-        'yaxis': {
-            'gridcolor': 'rgba(255,255,255,0.1)',
-            'linecolor': 'rgba(255,255,255,0.1)',
-            'tickfont': {'color': '#8892b0'},
-            **kwargs.get('yaxis', {})
-        }
-    }
-    # Add any extra kwargs that aren't xaxis/yaxis/margin
-    for k, v in kwargs.items():
-        if k not in ['xaxis', 'yaxis', 'margin']:
-            layout_args[k] = v
-    fig.update_layout(**layout_args)
+    """Apply per-chart layout on top of the dark template."""
+    fig.update_layout(height=height, margin=kwargs.pop('margin', dict(l=0, r=0, t=20, b=0)), **kwargs)
     return fig
 
 
-@st.cache_resource
-def get_bq_client():
-    """Initialize BigQuery client."""
+def get_credentials():
+    """Load service account credentials from Streamlit secrets, if configured."""
     # Use Streamlit secrets for credentials if available (Streamlit Cloud)
-    # Otherwise use default credentials (local development)
+    # Otherwise fall back to default credentials (local development)
     if "gcp_service_account" in st.secrets:
         from google.oauth2 import service_account
-        credentials = service_account.Credentials.from_service_account_info(
+        return service_account.Credentials.from_service_account_info(
             st.secrets["gcp_service_account"]
         )
-        return bigquery.Client(project='artful-logic-475116-p1', credentials=credentials)
-    return bigquery.Client(project='artful-logic-475116-p1')
+    return None
+
+
+@st.cache_resource
+def get_bq_client():
+    """Initialize BigQuery client."""
+    return bigquery.Client(project='artful-logic-475116-p1', credentials=get_credentials())
+
+
+@st.cache_resource
+def get_bqstorage_client():
+    """Initialize BigQuery Storage Read API client for Arrow result downloads."""
+    return bigquery_storage.BigQueryReadClient(credentials=get_credentials())
+
+
+def query_job_config(today=None):
+    """Build a job config, binding @today so date-relative queries stay cacheable in BigQuery."""
+    query_parameters = []
+    if today is not None:
+        query_parameters.append(bigquery.ScalarQueryParameter("today", "DATE", today))
+    return bigquery.QueryJobConfig(query_parameters=query_parameters, use_query_cache=True)
 
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
+def prune_query_cache():
+    """Delete cached query results that are past their TTL, e.g. files keyed on earlier days."""
+    cutoff = time.time() - CACHE_TTL_SECONDS
+    for path in CACHE_DIR.iterdir():
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except FileNotFoundError:
+            # Another thread or replica pruned it first
+            pass
+
+
+def run_query(query, today=None):
+    """Run a query and materialize the result as an Arrow-backed DataFrame.
+
+    Results are also written to a local Parquet file keyed by the query text and
+    its @today binding, so a restarted container can serve them from disk until
+    they are older than DISK_CACHE_MAX_AGE_SECONDS.
+    """
+    cache_key = hashlib.sha256(f"{query}\n{today}".encode()).hexdigest()
+    cache_path = CACHE_DIR / f"{cache_key}.parquet"
+    table = None
+    try:
+        if time.time() - cache_path.stat().st_mtime < DISK_CACHE_MAX_AGE_SECONDS:
+            table = pq.read_table(cache_path, memory_map=True)
+    except FileNotFoundError:
+        # Not cached yet, or pruned by another thread between stat and read
+        pass
+    if table is None:
+        client = get_bq_client()
+        job = client.query(query, job_config=query_job_config(today))
+        table = job.to_arrow(bqstorage_client=get_bqstorage_client())
+        CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # Write then rename so concurrent readers never see a partial file
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        pq.write_table(table, tmp_path, compression='zstd')
+        os.replace(tmp_path, cache_path)
+        prune_query_cache()
+    # Plotly 5 reads date columns via Series.dt.to_pydatetime(), which pandas rejects for
+    # date32[pyarrow], so DATE columns are converted to native datetime64
+    date_columns = [field.name for field in table.schema if pa.types.is_date(field.type)]
+    return table.to_pandas(types_mapper=pd.ArrowDtype).astype({name: 'datetime64[ns]' for name in date_columns})
+
+
+# Most recent month of agent stats within the last three months
+LATEST_AGENT_MONTH_QUERY = """
+    SELECT MAX(created_month)
+    FROM `artful-logic-475116-p1.mart_zendesk.dim_agent_performance`
+    WHERE created_month >= DATE_TRUNC(@today, MONTH) - INTERVAL 3 MONTH
+"""
+
+AGENT_DTYPES = {
+    'tickets_handled': pd.ArrowDtype(pa.int32()),
+}
+
+
+# Loaders use cache_resource so reruns get the cached frame itself rather than
+# an unpickled copy; results are shared across sessions and must not be mutated.
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, show_spinner=False)  # Cache for 5 minutes
 def load_daily_metrics():
-    """Load daily metrics from BigQuery."""
-    client = get_bq_client()
+    """Load the last 90 days of daily metrics from BigQuery, oldest first."""
     query = """
     SELECT *
-    FROM `artful-logic-475116-p1.mart_zendesk.dim_daily_metrics`
-    ORDER BY created_date DESC
-    LIMIT 90
+    FROM (
+        SELECT
+            *,
+            AVG(ticket_count) OVER (ORDER BY created_date ROWS BETWEEN 6 PRECEDING AND CURRENT ROW) as ma7,
+            csat_rate * 100 as csat_rate_pct
+        FROM `artful-logic-475116-p1.mart_zendesk.dim_daily_metrics`
+        ORDER BY created_date DESC
+        LIMIT 90
+    )
+    ORDER BY created_date
     """
-    return client.query(query).to_dataframe()
+    return run_query(query)
 
 
-@st.cache_data(ttl=300)
-def load_agent_performance():
-    """Load agent performance metrics."""
-    client = get_bq_client()
-    query = """
-    SELECT *
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_top_agents(today):
+    """Load the 10 agents with the most tickets handled in the latest month."""
+    query = f"""
+    SELECT agent_name, tickets_handled, csat_rate
+    FROM `artful-logic-475116-p1.mart_zendesk.dim_agent_performance`
+    WHERE created_month = ({LATEST_AGENT_MONTH_QUERY})
+    ORDER BY tickets_handled DESC
+    LIMIT 10
+    """
+    return run_query(query, today).astype(AGENT_DTYPES)
+
+
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_top_csat_agents(today):
+    """Load the 5 agents with the best CSAT (min 10 tickets) in the latest month."""
+    query = f"""
+    SELECT agent_name, tickets_handled, csat_rate
     FROM `artful-logic-475116-p1.mart_zendesk.dim_agent_performance`
-    WHERE created_month >= DATE_TRUNC(CURRENT_DATE(), MONTH) - INTERVAL 3 MONTH
-    ORDER BY created_month DESC, tickets_handled DESC
+    WHERE created_month = ({LATEST_AGENT_MONTH_QUERY})
+        AND tickets_handled >= 10
+        AND csat_rate IS NOT NULL
+    ORDER BY csat_rate DESC
+    LIMIT 5
     """
-    return client.query(query).to_dataframe()
+    return run_query(query, today).astype(AGENT_DTYPES)
 
 
-@st.cache_data(ttl=300)
-def load_current_stats():
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_current_stats(today):
     """Load current summary statistics."""
-    client = get_bq_client()
     query = """
     SELECT
         COUNT(*) as total_tickets,
@@ -297,18 +238,20 @@ def load_current_stats():
         ROUND(AVG(resolution_minutes_business) / 60, 1) as avg_resolution_hours,
         ROUND(100.0 * COUNTIF(resolved_same_day) / NULLIF(COUNTIF(is_resolved), 0), 1) as same_day_pct,
         ROUND(100.0 * COUNTIF(csat_score = 'good') / NULLIF(COUNTIF(csat_score IN ('good', 'bad')), 0), 1) as csat_rate,
-        COUNTIF(DATE(created_at) = CURRENT_DATE()) as today_tickets,
-        COUNTIF(DATE(created_at) = CURRENT_DATE() - 1) as yesterday_tickets,
+        COUNTIF(DATE(created_at) = @today) as today_tickets,
+        COUNTIF(DATE(created_at) = @today - 1) as yesterday_tickets,
         ROUND(100.0 * COUNTIF(first_response_under_1hr) / NULLIF(COUNT(*), 0), 1) as fast_response_pct
     FROM `artful-logic-475116-p1.mart_zendesk.fct_ticket_summary`
     """
-    return client.query(query).to_dataframe().iloc[0]
+    # Single summary row: read it straight off the row iterator instead of building a DataFrame
+    row = next(iter(get_bq_client().query(query, job_config=query_job_config(today)).result()))
+    # NULL aggregates become NaN, as they did via to_dataframe(), so the KPI formatting still works
+    return {key: float('nan') if value is None else value for key, value in row.items()}
 
 
-@st.cache_data(ttl=300)
-def load_tag_analysis():
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_tag_analysis(today):
     """Load tag analysis data."""
-    client = get_bq_client()
     query = """
     SELECT
         tag,
@@ -316,28 +259,36 @@ def load_tag_analysis():
         AVG(avg_resolution_minutes) as avg_resolution,
         AVG(csat_rate) as avg_csat
     FROM `artful-logic-475116-p1.mart_zendesk.dim_tag_analysis`
-    WHERE created_month >= DATE_TRUNC(CURRENT_DATE(), MONTH) - INTERVAL 2 MONTH
+    WHERE created_month >= DATE_TRUNC(@today, MONTH) - INTERVAL 2 MONTH
     GROUP BY tag
     ORDER BY total_tickets DESC
     LIMIT 15
     """
-    return client.query(query).to_dataframe()
+    return run_query(query, today).astype({
+        'total_tickets': pd.ArrowDtype(pa.int32()),
+    })
 
 
-@st.cache_data(ttl=300)
-def load_hourly_heatmap():
-    """Load hourly distribution data for heatmap."""
-    client = get_bq_client()
-    query = """
-    SELECT
-        created_day_of_week,
-        created_hour,
-        COUNT(*) as ticket_count
-    FROM `artful-logic-475116-p1.mart_zendesk.fct_ticket_summary`
-    WHERE created_date >= CURRENT_DATE() - 30
-    GROUP BY 1, 2
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_hourly_heatmap(today):
+    """Load hourly distribution data for heatmap, one row per weekday and one column per hour."""
+    hour_columns = ", ".join(f"{h} AS h{h}" for h in HOURS)
+    query = f"""
+    SELECT *
+    FROM (
+        SELECT created_day_of_week, created_hour
+        FROM `artful-logic-475116-p1.mart_zendesk.fct_ticket_summary`
+        WHERE created_date >= @today - 30
+    )
+    PIVOT(COUNT(*) FOR created_hour IN ({hour_columns}))
     """
-    return client.query(query).to_dataframe()
+    return run_query(query, today)
+
+
+@st.cache_resource
+def load_theme_css():
+    """Read the dark mode stylesheet once per process."""
+    return (Path(__file__).parent / "static" / "theme.css").read_text()
 
 
 def render_metric_card(value, label, delta=None, delta_type="positive"):
@@ -348,223 +299,187 @@ def render_metric_card(value, label, delta=None, delta_type="positive"):
         delta_symbol = "↑" if delta_type == "positive" else "↓"
         delta_html = f'<div class="{delta_class}">{delta_symbol} {delta}</div>'
 
-    return f"""
-    <div class="metric-card">
-        <div class="metric-value">{value}</div>
-        <div class="metric-label">{label}</div>
-        {delta_html}
-    </div>
-    """
-
-
-def main():
-    # Header
-    st.markdown("""
-    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 32px;">
-        <div>
-            <h1 class="dashboard-header">Support Command Center</h1>
-            <p class="dashboard-subtitle">B2C Customer Support Analytics • Real-time Insights</p>
-        </div>
-        <div class="live-indicator">
-            <span class="live-dot"></span>
-            Live Data
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-
-    # Load data
-    try:
-        stats = load_current_stats()
-        daily_df = load_daily_metrics()
-        agent_df = load_agent_performance()
-        tag_df = load_tag_analysis()
-        heatmap_df = load_hourly_heatmap()
-    except Exception as e:
-        st.error(f"Error loading data: {e}")
-        return
-
-    # KPI Cards Row
-    col1, col2, col3, col4, col5 = st.columns(5)
-
-    with col1:
-        st.markdown(render_metric_card(
+    # Kept free of indentation and blank lines so cards can be concatenated into one markdown block
+    return (
+        '<div class="metric-card">'
+        f'<div class="metric-value">{value}</div>'
+        f'<div class="metric-label">{label}</div>'
+        f'{delta_html}'
+        '</div>'
+    )
+
+
+@st.fragment
+def kpi_row(stats):
+    """Render the KPI cards row."""
+    backlog_status = "positive" if stats['backlog'] < 150 else "negative"
+    today_delta = stats['today_tickets'] - stats['yesterday_tickets']
+    today_delta_type = "negative" if today_delta > 0 else "positive"
+
+    # All cards go out in a single markdown element laid out by the .kpi-grid CSS grid
+    cards = [
+        render_metric_card(
             f"{stats['csat_rate']:.0f}%",
             "CSAT Score",
             "2.3% vs last week" if stats['csat_rate'] > 65 else None,
             "positive" if stats['csat_rate'] > 65 else "negative"
-        ), unsafe_allow_html=True)
-
-    with col2:
-        backlog_status = "positive" if stats['backlog'] < 150 else "negative"
-        st.markdown(render_metric_card(
+        ),
+        render_metric_card(
             f"{stats['backlog']:.0f}",
             "Open Backlog",
             delta_type=backlog_status
-        ), unsafe_allow_html=True)
-
-    with col3:
-        st.markdown(render_metric_card(
+        ),
+        render_metric_card(
             f"{stats['avg_resolution_hours']:.1f}h",
             "Avg Resolution"
-        ), unsafe_allow_html=True)
-
-    with col4:
-        st.markdown(render_metric_card(
+        ),
+        render_metric_card(
             f"{stats['same_day_pct']:.0f}%",
             "Same-Day Resolution"
-        ), unsafe_allow_html=True)
-
-    with col5:
-        today_delta = stats['today_tickets'] - stats['yesterday_tickets']
-        delta_type = "negative" if today_delta > 0 else "positive"
-        st.markdown(render_metric_card(
+        ),
+        render_metric_card(
             f"{stats['today_tickets']:.0f}",
             "Today's Tickets",
             f"{abs(today_delta):.0f} vs yesterday",
-            delta_type
-        ), unsafe_allow_html=True)
-
-    st.markdown("<br>", unsafe_allow_html=True)
-
-    # Charts Row 1
-    col1, col2 = st.columns([2, 1])
-
-    with col1:
-        st.markdown('<p class="section-header">📈 Ticket Volume Trend</p>', unsafe_allow_html=True)
-
-        daily_df_sorted = daily_df.sort_values('created_date')
-
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=daily_df_sorted['created_date'],
-            y=daily_df_sorted['ticket_count'],
+            today_delta_type
+        ),
+    ]
+    st.markdown(f'<div class="kpi-grid">{"".join(cards)}</div><br>', unsafe_allow_html=True)
+
+
+@st.fragment
+def volume_trend_chart(daily_df):
+    """Render the ticket volume trend with its 7-day average."""
+    st.markdown('<p class="section-header">📈 Ticket Volume Trend</p>', unsafe_allow_html=True)
+
+    # Traces as plain dicts so the figure is validated once at construction
+    fig = go.Figure(data=[
+        dict(
+            type='scattergl',
+            x=daily_df['created_date'],
+            y=daily_df['ticket_count'],
             mode='lines',
             name='Tickets',
             line=dict(color=COLORS['primary'], width=3),
             fill='tozeroy',
             fillcolor='rgba(102, 126, 234, 0.2)'
-        ))
-
-        # Add 7-day moving average
-        daily_df_sorted['ma7'] = daily_df_sorted['ticket_count'].rolling(7).mean()
-        fig.add_trace(go.Scatter(
-            x=daily_df_sorted['created_date'],
-            y=daily_df_sorted['ma7'],
+        ),
+        # 7-day moving average
+        dict(
+            type='scattergl',
+            x=daily_df['created_date'],
+            y=daily_df['ma7'],
             mode='lines',
             name='7-day avg',
             line=dict(color=COLORS['secondary'], width=2, dash='dot')
-        ))
-
-        apply_dark_theme(fig, height=350,
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1, font=dict(color='#8892b0')),
-            hovermode='x unified'
+        ),
+    ])
+
+    apply_dark_theme(fig, height=350,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1, font=dict(color='#8892b0')),
+        hovermode='x unified'
+    )
+    st.plotly_chart(fig, use_container_width=True, theme=None)
+
+
+@st.fragment
+def csat_trend_chart(daily_df):
+    """Render the daily CSAT trend against target."""
+    st.markdown('<p class="section-header">🎯 CSAT Trend</p>', unsafe_allow_html=True)
+
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=daily_df['created_date'],
+        y=daily_df['csat_rate_pct'],
+        mode='lines+markers',
+        name='CSAT %',
+        line=dict(color=COLORS['success'], width=2),
+        marker=dict(size=4)
+    ))
+
+    # Target line
+    fig.add_hline(y=70, line_dash="dash", line_color=COLORS['warning'],
+                  annotation_text="Target: 70%", annotation_position="right")
+
+    apply_dark_theme(fig, height=350, showlegend=False, yaxis={'range': [40, 100]})
+    st.plotly_chart(fig, use_container_width=True, theme=None)
+
+
+@st.fragment
+def volume_heatmap(heatmap_df):
+    """Render the weekday by hour ticket volume heatmap."""
+    st.markdown('<p class="section-header">🔥 Volume Heatmap</p>', unsafe_allow_html=True)
+
+    # Rows arrive already pivoted by hour; scatter them into a fixed weekday x hour grid
+    day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+    hour_counts = heatmap_df[[f"h{h}" for h in HOURS]].to_numpy(dtype='float64', na_value=np.nan)
+    day_idx = pd.Index(day_order).get_indexer(heatmap_df['created_day_of_week'])
+    known = day_idx >= 0
+    z = np.full((len(day_order), len(HOURS)), np.nan)
+    z[day_idx[known]] = hour_counts[known]
+
+    fig = go.Figure(data=go.Heatmap(
+        z=z,
+        x=[f"{h}:00" for h in HOURS],
+        y=day_order,
+        colorscale=[
+            [0, 'rgba(102, 126, 234, 0.1)'],
+            [0.5, 'rgba(102, 126, 234, 0.5)'],
+            [1, 'rgba(118, 75, 162, 1)']
+        ],
+        showscale=False
+    ))
+
+    apply_dark_theme(fig, height=300, margin=dict(l=0, r=0, t=10, b=0), xaxis={'tickangle': 45})
+    st.plotly_chart(fig, use_container_width=True, theme=None, config=STATIC_CHART_CONFIG)
+
+
+@st.fragment
+def top_tags_chart(tag_df):
+    """Render the top issue categories bar chart."""
+    st.markdown('<p class="section-header">🏷️ Top Issue Categories</p>', unsafe_allow_html=True)
+
+    tag_df_top = tag_df.head(8)
+
+    fig = go.Figure(go.Bar(
+        x=tag_df_top['total_tickets'],
+        y=tag_df_top['tag'],
+        orientation='h',
+        marker=dict(
+            color=tag_df_top['total_tickets'],
+            colorscale=[[0, COLORS['primary']], [1, COLORS['secondary']]],
         )
-        st.plotly_chart(fig, use_container_width=True)
-
-    with col2:
-        st.markdown('<p class="section-header">🎯 CSAT Trend</p>', unsafe_allow_html=True)
-
-        daily_df_sorted = daily_df.sort_values('created_date')
-        daily_df_sorted['csat_rate_pct'] = daily_df_sorted['csat_rate'] * 100
-
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=daily_df_sorted['created_date'],
-            y=daily_df_sorted['csat_rate_pct'],
-            mode='lines+markers',
-            name='CSAT %',
-            line=dict(color=COLORS['success'], width=2),
-            marker=dict(size=4)
-        ))
-
-        # Target line
-        fig.add_hline(y=70, line_dash="dash", line_color=COLORS['warning'],
-                      annotation_text="Target: 70%", annotation_position="right")
+    ))
 
-        apply_dark_theme(fig, height=350, showlegend=False, yaxis={'range': [40, 100]})
-        st.plotly_chart(fig, use_container_width=True)
+    apply_dark_theme(fig, height=300, margin=dict(l=0, r=0, t=10, b=0), yaxis={'autorange': 'reversed'})
+    st.plotly_chart(fig, use_container_width=True, theme=None, config=STATIC_CHART_CONFIG)
 
-    # Charts Row 2
-    col1, col2 = st.columns([1, 1])
-
-    with col1:
-        st.markdown('<p class="section-header">🔥 Volume Heatmap</p>', unsafe_allow_html=True)
-
-        # Pivot for heatmap
-        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        heatmap_pivot = heatmap_df.pivot_table(
-            index='created_day_of_week',
-            columns='created_hour',
-            values='ticket_count',
-            aggfunc='sum'
-        ).reindex(day_order)
-
-        fig = go.Figure(data=go.Heatmap(
-            z=heatmap_pivot.values,
-            x=[f"{h}:00" for h in heatmap_pivot.columns],
-            y=heatmap_pivot.index,
-            colorscale=[
-                [0, 'rgba(102, 126, 234, 0.1)'],
-                [0.5, 'rgba(102, 126, 234, 0.5)'],
-                [1, 'rgba(118, 75, 162, 1)']
-            ],
-            showscale=False,
-            hovertemplate='%{y}<br>%{x}<br>Tickets: %{z}<extra></extra>'
-        ))
-
-        apply_dark_theme(fig, height=300, margin=dict(l=0, r=0, t=10, b=0), xaxis={'tickangle': 45})
-        st.plotly_chart(fig, use_container_width=True)
-
-    with col2:
-        st.markdown('<p class="section-header">🏷️ Top Issue Categories</p>', unsafe_allow_html=True)
 
-        tag_df_top = tag_df.head(8)
-
-        fig = go.Figure(go.Bar(
-            x=tag_df_top['total_tickets'],
-            y=tag_df_top['tag'],
-            orientation='h',
-            marker=dict(
-                color=tag_df_top['total_tickets'],
-                colorscale=[[0, COLORS['primary']], [1, COLORS['secondary']]],
-            ),
-            hovertemplate='%{y}<br>Tickets: %{x}<extra></extra>'
-        ))
-
-        apply_dark_theme(fig, height=300, margin=dict(l=0, r=0, t=10, b=0), yaxis={'autorange': 'reversed'})
-        st.plotly_chart(fig, use_container_width=True)
-
-    # Agent Performance Section
+@st.fragment
+def agent_performance(top_agents, top_csat):
+    """Render the agent leaderboard and top CSAT agents for the current month."""
     st.markdown('<p class="section-header">👥 Agent Performance</p>', unsafe_allow_html=True)
 
-    # Get current month data
-    current_month = agent_df[agent_df['created_month'] == agent_df['created_month'].max()]
-
-    if not current_month.empty:
+    if not top_agents.empty:
         col1, col2 = st.columns([2, 1])
 
         with col1:
-            # Leaderboard
-            top_agents = current_month.nlargest(10, 'tickets_handled')
-
-            fig = go.Figure()
-
-            # Tickets handled bars
-            fig.add_trace(go.Bar(
-                x=top_agents['agent_name'],
-                y=top_agents['tickets_handled'],
-                name='Tickets Handled',
-                marker_color=COLORS['primary'],
-                hovertemplate='%{x}<br>Tickets: %{y}<extra></extra>'
-            ))
+            # Leaderboard: tickets handled bars
+            fig = go.Figure(data=[
+                dict(
+                    type='bar',
+                    x=top_agents['agent_name'],
+                    y=top_agents['tickets_handled'],
+                    name='Tickets Handled',
+                    marker_color=COLORS['primary']
+                ),
+            ])
 
             apply_dark_theme(fig, height=350, xaxis={'tickangle': 45}, showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig, use_container_width=True, theme=None, config=STATIC_CHART_CONFIG)
 
         with col2:
             # CSAT by agent (top performers)
-            top_csat = current_month[current_month['tickets_handled'] >= 10].nlargest(5, 'csat_rate')
-
             if not top_csat.empty:
                 fig = go.Figure(go.Bar(
                     x=top_csat['csat_rate'] * 100,
@@ -584,7 +499,77 @@ def main():
                     xaxis={'range': [50, 100]},
                     yaxis={'autorange': 'reversed'}
                 )
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True, theme=None)
+
+
+def main():
+    # Dark mode custom CSS
+    st.html(f"<style>{load_theme_css()}</style>")
+
+    # Header
+    st.markdown("""
+    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 32px;">
+        <div>
+            <h1 class="dashboard-header">Support Command Center</h1>
+            <p class="dashboard-subtitle">B2C Customer Support Analytics • Real-time Insights</p>
+        </div>
+        <div class="live-indicator">
+            <span class="live-dot"></span>
+            Live Data
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Load data
+    # Date-relative loaders are keyed on the UTC day so their caches roll over at midnight
+    today = datetime.now(timezone.utc).date()
+    # Queries run concurrently so a cold load costs one round-trip, not one per query
+    loaders = {
+        'stats': partial(load_current_stats, today),
+        'daily': load_daily_metrics,
+        'top_agents': partial(load_top_agents, today),
+        'top_csat': partial(load_top_csat_agents, today),
+        'tag': partial(load_tag_analysis, today),
+        'heatmap': partial(load_hourly_heatmap, today),
+    }
+    ctx = get_script_run_ctx()
+    try:
+        with ThreadPoolExecutor(max_workers=len(loaders), initializer=add_script_run_ctx,
+                                initargs=(None, ctx)) as executor:
+            futures = {name: executor.submit(fn) for name, fn in loaders.items()}
+            results = {name: future.result() for name, future in futures.items()}
+        stats = results['stats']
+        daily_df = results['daily']
+        top_agents = results['top_agents']
+        top_csat = results['top_csat']
+        tag_df = results['tag']
+        heatmap_df = results['heatmap']
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
+        return
+
+    # Each section is a fragment, so a widget interaction only reruns its own section
+    kpi_row(stats)
+
+    # Charts Row 1
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        volume_trend_chart(daily_df)
+
+    with col2:
+        csat_trend_chart(daily_df)
+
+    # Charts Row 2
+    col1, col2 = st.columns([1, 1])
+
+    with col1:
+        volume_heatmap(heatmap_df)
+
+    with col2:
+        top_tags_chart(tag_df)
+
+    agent_performance(top_agents, top_csat)
 
     # Footer
     st.markdown(f"""